@@ -4,10 +4,18 @@ Ontario Tech Course Registration Bot
 Quick setup for automated course registration assistance
 """
 
+import functools
+import html
 import json
+import os
+import queue
+import re
 import time
+import itertools
 import sqlite3
+import threading
 from datetime import datetime
+from urllib.parse import urlsplit, urlencode
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -15,11 +23,72 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.core.driver_cache import DriverCacheManager
 import requests
-from dataclasses import dataclass
-from typing import List, Dict, Optional
+from dataclasses import dataclass, fields
+from typing import List, Dict, Optional, Tuple
 
-@dataclass
+# Locators for the Select2 term picker
+SELECT2_CONTAINER = (By.CSS_SELECTOR, ".select2-container")
+SELECT2_INPUT = (By.CSS_SELECTOR, ".select2-input")
+SELECT2_RESULT = (By.CSS_SELECTOR, ".select2-results .select2-result")
+SELECT2_OPEN_DROP = (By.CSS_SELECTOR, ".select2-drop-active")
+
+# Candidate locators for the course search/registration page, tried in order
+COURSE_SEARCH_LOCATORS = tuple((By.CSS_SELECTOR, selector) for selector in (
+    "input[placeholder*='course']",
+    "input[placeholder*='Course']",
+    ".course-search",
+    "#course-search",
+    "input[name*='course']",
+    ".search-input"
+))
+
+# Reads every course row's fields in the browser; missing cells come back as null
+COURSE_ROWS_SCRIPT = """
+const text = (row, selector) => {
+    const el = row.querySelector(selector);
+    return el ? el.innerText.trim() : null;
+};
+return Array.from(document.querySelectorAll('.course-row')).map(row => ({
+    code: text(row, '.course-code'),
+    name: text(row, '.course-name'),
+    credits: text(row, '.credits'),
+    availability: text(row, '.availability'),
+    instructor: text(row, '.instructor'),
+    schedule: text(row, '.schedule'),
+    status: text(row, '.status')
+}));
+"""
+
+# Banner self-service registration API, relative to the SSB host
+BANNER_SSB_PATH = "/StudentRegistrationSsb/ssb"
+BANNER_PAGE_SIZE = 500
+BANNER_TIMEOUT = 30
+BANNER_DAYS = (
+    ("monday", "M"), ("tuesday", "T"), ("wednesday", "W"), ("thursday", "R"),
+    ("friday", "F"), ("saturday", "S"), ("sunday", "U")
+)
+
+# One match per line of availability text; unparseable lines match with empty groups
+AVAILABILITY_RE = re.compile(r"^[ \t]*(?:(\d+)[ \t]*/[ \t]*(\d+))?.*$", re.MULTILINE)
+
+# Background writer flushes every WRITE_INTERVAL seconds or WRITE_BATCH_ROWS rows
+WRITE_QUEUE_SIZE = 10_000
+WRITE_BATCH_ROWS = 1000
+WRITE_INTERVAL = 2.0
+# Queued after each poll's courses so the writer flushes without waiting out the interval
+END_OF_POLL = object()
+# How long shutdown waits for the background workers before giving up on them
+THREAD_JOIN_TIMEOUT = 5
+
+# Persistent ChromeDriver cache so warm launches skip the download
+CHROMEDRIVER_CACHE_DIR = os.path.expanduser("~/.cache/cdm")
+
+# Rows per multi-row INSERT; 9 columns x 50 rows stays under SQLite's 999 parameter limit
+INSERT_BATCH_SIZE = 50
+
+@dataclass(slots=True, frozen=True)
 class Course:
     code: str
     name: str
@@ -31,16 +100,63 @@ class Course:
     prerequisites: str
     status: str  # "Open", "Closed", "Waitlist"
 
+# Selected in Course field order so rows map straight onto the constructor
+COURSE_COLUMNS = ", ".join(field.name for field in fields(Course))
+
+def course_row_factory(cursor, row) -> Course:
+    """sqlite3 row factory for queries selecting COURSE_COLUMNS"""
+    return Course(*row)
+
+@functools.lru_cache(maxsize=1)
+def _driver_path() -> str:
+    """Resolve the ChromeDriver binary once per process"""
+    return ChromeDriverManager(cache_manager=DriverCacheManager(root_dir=CHROMEDRIVER_CACHE_DIR)).install()
+
 class OntarioTechBot:
+    # SQL kept as constants so the connection's statement cache reuses compiled plans
+    SELECT_WATCHLIST_SQL = "SELECT course_code FROM user_watchlist ORDER BY priority"
+    SELECT_COURSE_SQL = f"SELECT {COURSE_COLUMNS} FROM courses WHERE code = ?"
+    INSERT_WATCHLIST_SQL = '''
+        INSERT OR REPLACE INTO user_watchlist (course_code, priority, auto_register)
+        VALUES (?, ?, ?)
+    '''
+    DELETE_WATCHLIST_SQL = "DELETE FROM user_watchlist WHERE course_code = ?"
+    SELECT_WATCHLIST_AVAILABILITY_SQL = '''
+        SELECT w.course_code, c.name, c.available_spots
+        FROM user_watchlist w LEFT JOIN courses c ON c.code = w.course_code
+        ORDER BY w.priority
+    '''
+
     def __init__(self):
         self.driver = None
         self.db_path = "courses.db"
+        # Term chosen in the browser; scrapes must use it since they share its Banner session
+        self.term = None
+        self.conn = None
+        self.db_lock = threading.Lock()
+        # The scraper thread and registration share the browser
+        self.driver_lock = threading.Lock()
+        self._courses_updated = threading.Event()
+        # course code -> (course, monotonic timestamp); cleared whenever courses are saved
+        self._avail_cache: Dict[str, Tuple[Optional[Course], float]] = {}
+        self.cache_ttl = 10.0
+        # Set to the full ".../StudentRegistrationSsb/ssb" URL if it differs from the browser's host
+        self.banner_url = None
+        self._http = None
+        self._term_codes: Dict[str, str] = {}
+        self._active_term = None
+        # request URL -> (ETag, payload) for conditional GETs
+        self._etag_cache: Dict[str, Tuple[str, dict]] = {}
+        self.use_browser_scrape = False
         self.setup_database()
-        
+
     def setup_database(self):
-        """Initialize SQLite database for course data"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        """Initialize SQLite database and open the shared connection"""
+        self.conn = self._open_connection()
+        cursor = self.conn.cursor()
+        
+        # WAL is persisted in the database file, so later connections inherit it
+        cursor.execute("PRAGMA journal_mode=WAL")
         
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS courses (
@@ -68,9 +184,33 @@ class OntarioTechBot:
             )
         ''')
         
-        conn.commit()
-        conn.close()
+        # Partial index for the "available courses" menu; covering index for the ordered watchlist
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_courses_avail
+            ON courses(available_spots) WHERE available_spots > 0
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_watchlist_prio
+            ON user_watchlist(priority, course_code)
+        ''')
     
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open a connection with the bot's per-connection PRAGMAs applied"""
+        # Transactions are managed explicitly; single statements autocommit
+        conn = sqlite3.connect(
+            self.db_path,
+            isolation_level=None,
+            cached_statements=256,
+            check_same_thread=False
+        )
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-20000")
+        # Map hot pages for the read-heavy menu and monitor loop; wait out a concurrent writer
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
     def setup_driver(self, headless=True):
         """Setup Chrome driver with appropriate options"""
         chrome_options = Options()
@@ -81,8 +221,15 @@ class OntarioTechBot:
         chrome_options.add_argument("--disable-blink-features=AutomationControlled")
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
+        # Course data is tabular; skip images and notifications and return at DOMContentLoaded
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2
+        })
+        chrome_options.page_load_strategy = "eager"
         
-        self.driver = webdriver.Chrome(service=webdriver.chrome.service.Service(ChromeDriverManager().install()), options=chrome_options)
+        self.driver = webdriver.Chrome(service=Service(_driver_path()), options=chrome_options)
         self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
         
     def login_to_platform(self, username: str, password: str, url: str = None):
@@ -127,25 +274,25 @@ class OntarioTechBot:
             
             # Find and click the Select2 dropdown trigger
             # Look for the main select2 container
-            dropdown_trigger = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, ".select2-container")))
+            dropdown_trigger = wait.until(EC.element_to_be_clickable(SELECT2_CONTAINER))
             dropdown_trigger.click()
             
             # Wait for dropdown to open
-            time.sleep(1)
+            search_input = wait.until(EC.visibility_of_element_located(SELECT2_INPUT))
             
             # Search for the term in the dropdown
-            search_input = self.driver.find_element(By.CSS_SELECTOR, ".select2-input")
             search_input.clear()
             search_input.send_keys(term)
             
             # Wait for results to load
-            time.sleep(2)
+            wait.until(EC.presence_of_element_located(SELECT2_RESULT))
             
             # Click on the matching result
-            results = self.driver.find_elements(By.CSS_SELECTOR, ".select2-results .select2-result")
+            results = self.driver.find_elements(*SELECT2_RESULT)
             for result in results:
                 if term.lower() in result.text.lower():
                     result.click()
+                    self.term = term
                     print(f"✅ Selected term: {term}")
                     return True
             
@@ -162,27 +309,17 @@ class OntarioTechBot:
             if not self.select_term(term):
                 return False
             
-            # Wait a bit for the page to update after term selection
-            time.sleep(2)
-            
-            # Now look for course search or registration elements
-            # Try multiple possible selectors since we don't know the exact structure yet
             wait = WebDriverWait(self.driver, 10)
             
-            # Try to find course search/registration page elements
-            possible_selectors = [
-                "input[placeholder*='course']",
-                "input[placeholder*='Course']",
-                ".course-search",
-                "#course-search",
-                "input[name*='course']",
-                ".search-input"
-            ]
+            # Wait for the dropdown to close so the page reflects the selected term
+            wait.until(EC.invisibility_of_element_located(SELECT2_OPEN_DROP))
             
+            # Now look for course search or registration elements
+            # Try multiple possible selectors since we don't know the exact structure yet
             course_search_element = None
-            for selector in possible_selectors:
+            for locator in COURSE_SEARCH_LOCATORS:
                 try:
-                    course_search_element = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
+                    course_search_element = wait.until(EC.presence_of_element_located(locator))
                     break
                 except:
                     continue
@@ -199,26 +336,49 @@ class OntarioTechBot:
             return False
     
     def scrape_course_data(self, term: str, subject: str = None):
-        """Scrape course data from the platform"""
+        """Fetch course data from Banner's search API, falling back to the page DOM"""
+        with self.driver_lock:
+            courses, _ = self._scrape(term, subject)
+        return courses
+    
+    def _scrape(self, term: str, subject: str = None) -> Tuple[List[Course], bool]:
+        """Scrape courses and report whether they changed; caller must hold driver_lock"""
+        try:
+            session = self._banner_session()
+            base_url = self._banner_base_url()
+            term_code = self._select_banner_term(session, base_url, term)
+            courses, changed = self._fetch_banner_courses(session, base_url, term_code, subject)
+            self.use_browser_scrape = False
+            return courses, changed
+        except Exception as e:
+            print(f"⚠️ Course search API unavailable ({e}), reading the page instead")
+            self._reset_banner_state()
+            self.use_browser_scrape = True
+            return self._scrape_page(), True
+    
+    def _scrape_page(self) -> List[Course]:
+        """Scrape course rows from the currently loaded page"""
         courses = []
         
         try:
             # This is a template - you'll need to customize based on actual HTML structure
-            course_rows = self.driver.find_elements(By.CSS_SELECTOR, ".course-row")
+            # Extract every row in one script call instead of a WebDriver round trip per field
+            course_rows = self.driver.execute_script(COURSE_ROWS_SCRIPT) or []
+            availabilities = self.parse_availabilities([row["availability"] or "" for row in course_rows])
             
-            for row in course_rows:
+            for row, (available_spots, total_spots) in zip(course_rows, availabilities):
                 try:
-                    code = row.find_element(By.CSS_SELECTOR, ".course-code").text
-                    name = row.find_element(By.CSS_SELECTOR, ".course-name").text
-                    credits = int(row.find_element(By.CSS_SELECTOR, ".credits").text)
+                    missing = [field for field, value in row.items() if value is None]
+                    if missing:
+                        raise ValueError(f"missing fields {missing}")
                     
-                    # Parse availability
-                    availability_text = row.find_element(By.CSS_SELECTOR, ".availability").text
-                    available_spots, total_spots = self.parse_availability(availability_text)
+                    code = row["code"]
+                    name = row["name"]
+                    credits = int(row["credits"])
                     
-                    instructor = row.find_element(By.CSS_SELECTOR, ".instructor").text
-                    schedule = row.find_element(By.CSS_SELECTOR, ".schedule").text
-                    status = row.find_element(By.CSS_SELECTOR, ".status").text
+                    instructor = row["instructor"]
+                    schedule = row["schedule"]
+                    status = row["status"]
                     
                     course = Course(
                         code=code,
@@ -243,77 +403,247 @@ class OntarioTechBot:
             
         return courses
     
+    def _banner_base_url(self) -> str:
+        """Base URL of the Banner self-service API, derived from the browser if not set"""
+        if self.banner_url:
+            return self.banner_url.rstrip("/")
+        parts = urlsplit(self.driver.current_url)
+        return f"{parts.scheme}://{parts.netloc}{BANNER_SSB_PATH}"
+
+    def _banner_session(self) -> requests.Session:
+        """HTTP session carrying the browser's login cookies"""
+        if self._http is None:
+            self._http = requests.Session()
+            self._http.headers.update({"Accept": "application/json"})
+        for cookie in self.driver.get_cookies():
+            self._http.cookies.set(
+                cookie["name"], cookie["value"],
+                domain=cookie.get("domain", ""), path=cookie.get("path", "/")
+            )
+        return self._http
+
+    def _select_banner_term(self, session: requests.Session, base_url: str, term: str) -> str:
+        """Resolve a term name like 'Winter 2026' to its Banner code and make it active"""
+        term_code = self._term_codes.get(term)
+
+        if term_code is None:
+            response = session.get(
+                f"{base_url}/classSearch/getTerms",
+                params={"searchTerm": term, "offset": 1, "max": 10},
+                timeout=BANNER_TIMEOUT
+            )
+            response.raise_for_status()
+            for option in response.json():
+                if term.lower() in html.unescape(option["description"]).lower():
+                    term_code = option["code"]
+                    break
+            else:
+                raise ValueError(f"term '{term}' not offered")
+            self._term_codes[term] = term_code
+
+        # Banner only returns search results for the term stored in the server-side session
+        if self._active_term != term_code:
+            response = session.post(
+                f"{base_url}/term/search",
+                params={"mode": "search"},
+                data={"term": term_code},
+                timeout=BANNER_TIMEOUT
+            )
+            response.raise_for_status()
+            self._active_term = term_code
+        return term_code
+
+    def _fetch_banner_courses(self, session: requests.Session, base_url: str, term_code: str, subject: str = None) -> Tuple[List[Course], bool]:
+        """Page through Banner search results; returns the courses and whether any page changed"""
+        url = f"{base_url}/searchResults/searchResults"
+        courses: Dict[str, Course] = {}
+        changed = False
+        offset = 0
+
+        while True:
+            params = {"txt_term": term_code, "pageOffset": offset, "pageMaxSize": BANNER_PAGE_SIZE}
+            if subject:
+                params["txt_subject"] = subject
+            payload, page_changed = self._conditional_get(session, url, params)
+            changed = changed or page_changed
+            if payload.get("success") is False:
+                raise ValueError("search rejected by Banner")
+
+            sections = payload.get("data") or []
+            if offset == 0 and not sections:
+                # An expired session or a term switched elsewhere also looks like this; re-post next time
+                self._reset_banner_state()
+            for section in sections:
+                course = self._course_from_section(section)
+                # Keep the section with the most open seats for each course
+                current = courses.get(course.code)
+                if current is None or course.available_spots > current.available_spots:
+                    courses[course.code] = course
+
+            offset += len(sections)
+            if not sections or offset >= payload.get("totalCount", 0):
+                break
+
+        return list(courses.values()), changed
+
+    def _reset_banner_state(self):
+        """Forget the active term and cached pages so the next search starts clean"""
+        self._active_term = None
+        self._etag_cache.clear()
+
+    def _conditional_get(self, session: requests.Session, url: str, params: dict) -> Tuple[dict, bool]:
+        """GET a JSON endpoint, reusing the cached payload when the server answers 304"""
+        key = f"{url}?{urlencode(sorted(params.items()))}"
+        cached = self._etag_cache.get(key)
+        headers = {"If-None-Match": cached[0]} if cached else {}
+
+        response = session.get(url, params=params, headers=headers, timeout=BANNER_TIMEOUT)
+        if cached and response.status_code == 304:
+            return cached[1], False
+
+        response.raise_for_status()
+        payload = response.json()
+        etag = response.headers.get("ETag")
+        if etag:
+            self._etag_cache[key] = (etag, payload)
+        return payload, True
+
+    def _course_from_section(self, section: dict) -> Course:
+        """Convert a Banner section record into a Course"""
+        instructor = ", ".join(
+            faculty["displayName"] for faculty in section.get("faculty") or [] if faculty.get("displayName")
+        )
+
+        meetings = []
+        for meeting in section.get("meetingsFaculty") or []:
+            meeting_time = meeting.get("meetingTime") or {}
+            days = "".join(abbr for day, abbr in BANNER_DAYS if meeting_time.get(day))
+            if days and meeting_time.get("beginTime"):
+                meetings.append(f"{days} {meeting_time['beginTime']}-{meeting_time.get('endTime', '')}")
+
+        available_spots = section.get("seatsAvailable") or 0
+        if section.get("openSection"):
+            status = "Open"
+        elif (section.get("waitAvailable") or 0) > 0:
+            status = "Waitlist"
+        else:
+            status = "Closed"
+
+        return Course(
+            code=section["subjectCourse"],
+            name=html.unescape(section.get("courseTitle") or ""),
+            credits=int(section.get("creditHours") or section.get("creditHourLow") or 0),
+            available_spots=available_spots,
+            total_spots=section.get("maximumEnrollment") or 0,
+            instructor=instructor,
+            schedule="; ".join(meetings),
+            prerequisites="",  # Will be filled by LLM later
+            status=status
+        )
+
     def parse_availability(self, availability_text: str) -> tuple:
         """Parse availability text like '15/30' into (available, total)"""
-        try:
-            parts = availability_text.split("/")
-            available = int(parts[0])
-            total = int(parts[1])
-            return available, total
-        except:
-            return 0, 0
+        return self.parse_availabilities([availability_text or ""])[0]
+    
+    def parse_availabilities(self, availability_texts: List[str]) -> List[tuple]:
+        """Parse many availability texts in a single regex pass, (0, 0) for malformed ones"""
+        if not availability_texts:
+            return []
+        # Newlines inside a cell would shift the one-line-per-row alignment
+        blob = "\n".join(" ".join(text.splitlines()) for text in availability_texts)
+        return [
+            (int(available), int(total)) if available else (0, 0)
+            for available, total in AVAILABILITY_RE.findall(blob)
+        ]
     
     def save_courses_to_db(self, courses: List[Course]):
         """Save course data to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        for course in courses:
-            cursor.execute('''
-                INSERT OR REPLACE INTO courses 
-                (code, name, credits, available_spots, total_spots, instructor, schedule, prerequisites, status)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
+        with self.db_lock:
+            self._write_courses(self.conn, courses)
+        self._avail_cache.clear()
+        print(f"✅ Saved {len(courses)} courses to database")
+    
+    def _write_courses(self, conn: sqlite3.Connection, courses: List[Course]):
+        """Upsert courses in one transaction on the given connection"""
+        rows = [
+            (
                 course.code, course.name, course.credits, course.available_spots,
                 course.total_spots, course.instructor, course.schedule,
                 course.prerequisites, course.status
-            ))
+            )
+            for course in courses
+        ]
         
-        conn.commit()
-        conn.close()
-        print(f"✅ Saved {len(courses)} courses to database")
+        # One explicit transaction so the whole batch is a single commit
+        cursor = conn.cursor()
+        try:
+            cursor.execute("BEGIN")
+            for start in range(0, len(rows), INSERT_BATCH_SIZE):
+                chunk = rows[start:start + INSERT_BATCH_SIZE]
+                placeholders = ", ".join(["(?, ?, ?, ?, ?, ?, ?, ?, ?)"] * len(chunk))
+                cursor.execute(f'''
+                    INSERT OR REPLACE INTO courses
+                    (code, name, credits, available_spots, total_spots, instructor, schedule, prerequisites, status)
+                    VALUES {placeholders}
+                ''', list(itertools.chain.from_iterable(chunk)))
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
     
     def get_watchlist_courses(self) -> List[str]:
         """Get courses from user's watchlist"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT course_code FROM user_watchlist ORDER BY priority")
-        watchlist = [row[0] for row in cursor.fetchall()]
-        
-        conn.close()
+        with self.db_lock:
+            cursor = self.conn.cursor()
+            cursor.execute(self.SELECT_WATCHLIST_SQL)
+            watchlist = [row[0] for row in cursor.fetchall()]
+
         return watchlist
     
+    def get_watchlist_with_availability(self) -> List[tuple]:
+        """Get (course_code, name, available_spots) for the watchlist in one query"""
+        with self.db_lock:
+            cursor = self.conn.cursor()
+            cursor.execute(self.SELECT_WATCHLIST_AVAILABILITY_SQL)
+            return cursor.fetchall()
+    
     def add_to_watchlist(self, course_code: str, priority: int = 1, auto_register: bool = False):
         """Add course to watchlist"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR REPLACE INTO user_watchlist (course_code, priority, auto_register)
-            VALUES (?, ?, ?)
-        ''', (course_code, priority, auto_register))
-        
-        conn.commit()
-        conn.close()
+        with self.db_lock:
+            cursor = self.conn.cursor()
+            cursor.execute(self.INSERT_WATCHLIST_SQL, (course_code, priority, auto_register))
+
         print(f"✅ Added {course_code} to watchlist")
     
     def check_course_availability(self, course_code: str) -> Optional[Course]:
         """Check if a specific course has availability"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cached = self._avail_cache.get(course_code)
+        if cached and time.monotonic() - cached[1] < self.cache_ttl:
+            return cached[0]
+        
+        with self.db_lock:
+            cursor = self.conn.cursor()
+            cursor.row_factory = course_row_factory
+            cursor.execute(self.SELECT_COURSE_SQL, (course_code,))
+            course = cursor.fetchone()
         
-        cursor.execute("SELECT * FROM courses WHERE code = ?", (course_code,))
-        row = cursor.fetchone()
-        conn.close()
+        self._avail_cache[course_code] = (course, time.monotonic())
+        return course
+    
+    def check_courses_availability(self, course_codes: List[str]) -> Dict[str, Course]:
+        """Look up several courses with a single query, keyed by course code"""
+        if not course_codes:
+            return {}
         
-        if row:
-            return Course(
-                code=row[1], name=row[2], credits=row[3], available_spots=row[4],
-                total_spots=row[5], instructor=row[6], schedule=row[7],
-                prerequisites=row[8], status=row[9]
+        placeholders = ", ".join("?" * len(course_codes))
+        with self.db_lock:
+            cursor = self.conn.cursor()
+            cursor.row_factory = course_row_factory
+            cursor.execute(
+                f"SELECT {COURSE_COLUMNS} FROM courses WHERE code IN ({placeholders})",
+                course_codes
             )
-        return None
+            return {course.code: course for course in cursor.fetchall()}
     
     def attempt_registration(self, course_code: str) -> bool:
         """Attempt to register for a course"""
@@ -341,42 +671,148 @@ class OntarioTechBot:
         """Monitor watchlist courses and auto-register when available"""
         attempt = 0
         
-        while attempt < max_attempts:
-            print(f"\n🔄 Monitoring attempt {attempt + 1}/{max_attempts}")
-            
-            # Refresh course data
-            self.driver.refresh()
-            courses = self.scrape_course_data(term="Winter 2025")  # Adjust term as needed
-            self.save_courses_to_db(courses)
-            
-            # Check watchlist
-            watchlist = self.get_watchlist_courses()
-            
-            for course_code in watchlist:
-                course = self.check_course_availability(course_code)
-                if course and course.available_spots > 0:
-                    print(f"🎯 {course_code} is available! Attempting registration...")
-                    if self.attempt_registration(course_code):
-                        # Remove from watchlist after successful registration
-                        self.remove_from_watchlist(course_code)
+        # Scraping and database writes run in the background so they overlap the polling delay
+        stop = threading.Event()
+        write_queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+        self._courses_updated.clear()
+        scraper = threading.Thread(target=self._scrape_worker, args=(self.term, delay, write_queue, stop), daemon=True)
+        writer = threading.Thread(target=self._writer_worker, args=(write_queue, stop), daemon=True)
+        scraper.start()
+        writer.start()
+        
+        try:
+            while attempt < max_attempts:
+                # Wake up as soon as fresh data lands, or after the delay if nothing changed
+                self._courses_updated.wait(timeout=delay)
+                self._courses_updated.clear()
+                print(f"\n🔄 Monitoring attempt {attempt + 1}/{max_attempts}")
+                
+                # Check watchlist
+                watchlist = self.get_watchlist_courses()
+                available = self.check_courses_availability(watchlist)
                 
-            attempt += 1
-            if attempt < max_attempts:
-                print(f"⏳ Waiting {delay} seconds before next check...")
-                time.sleep(delay)
+                for course_code in watchlist:
+                    course = available.get(course_code)
+                    if course and course.available_spots > 0:
+                        print(f"🎯 {course_code} is available! Attempting registration...")
+                        with self.driver_lock:
+                            # The API scrape never reloads the page, so refresh it before looking for the course
+                            try:
+                                self.driver.refresh()
+                            except Exception as e:
+                                print(f"⚠️ Could not reload the page before registering: {e}")
+                            registered = self.attempt_registration(course_code)
+                        if registered:
+                            # Remove from watchlist after successful registration
+                            self.remove_from_watchlist(course_code)
+                
+                attempt += 1
+        finally:
+            stop.set()
+            # A scrape stuck on the network shouldn't hang shutdown; the threads are daemons
+            scraper.join(timeout=THREAD_JOIN_TIMEOUT)
+            writer.join(timeout=THREAD_JOIN_TIMEOUT)
+    
+    def _scrape_worker(self, term: str, delay: int, write_queue: queue.Queue, stop: threading.Event):
+        """Producer: scrape every `delay` seconds and queue changed courses for the writer"""
+        while not stop.is_set():
+            # Refresh course data; the page only needs reloading when the API is unavailable
+            try:
+                # The API calls share the browser's session, so they must not overlap a registration
+                with self.driver_lock:
+                    if self.use_browser_scrape:
+                        self.driver.refresh()
+                    courses, changed = self._scrape(term)
+            except Exception as e:
+                print(f"❌ Error refreshing course data: {e}")
+                courses, changed = [], False
+            
+            if changed:
+                for item in itertools.chain(courses, (END_OF_POLL,)):
+                    # Block while the writer catches up, but stay responsive to shutdown
+                    while not stop.is_set():
+                        try:
+                            write_queue.put(item, timeout=1)
+                            break
+                        except queue.Full:
+                            continue
+            else:
+                print("📭 Course data unchanged since last check")
+            
+            print(f"⏳ Waiting {delay} seconds before next check...")
+            stop.wait(delay)
+    
+    def _writer_worker(self, write_queue: queue.Queue, stop: threading.Event):
+        """Consumer: drain queued courses into SQLite in large batches on its own connection"""
+        conn = self._open_connection()
+        # Rows from a failed write; retried with the next batch so a 304 can't hide them
+        pending: Dict[str, Course] = {}
+        pending_ends_poll = False
+        try:
+            while not (stop.is_set() and write_queue.empty()):
+                batch = dict(pending)
+                ends_poll = pending_ends_poll
+                try:
+                    item = write_queue.get(timeout=WRITE_INTERVAL)
+                except queue.Empty:
+                    # Nothing new; just retry any pending rows
+                    item = None
+                
+                if item is END_OF_POLL:
+                    ends_poll = True
+                elif item is not None:
+                    # Collect rows until the poll ends, the batch is full or the window closes
+                    batch[item.code] = item
+                    deadline = time.monotonic() + WRITE_INTERVAL
+                    while len(batch) < WRITE_BATCH_ROWS:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        try:
+                            item = write_queue.get(timeout=remaining)
+                        except queue.Empty:
+                            break
+                        if item is END_OF_POLL:
+                            ends_poll = True
+                            break
+                        batch[item.code] = item
+                
+                if batch:
+                    try:
+                        self._write_courses(conn, list(batch.values()))
+                    except Exception as e:
+                        print(f"❌ Error saving courses, will retry: {e}")
+                        pending, pending_ends_poll = batch, ends_poll
+                        continue
+                    pending, pending_ends_poll = {}, False
+                    self._avail_cache.clear()
+                    print(f"✅ Saved {len(batch)} courses to database")
+                
+                # Only wake the monitor once a whole poll is in the table
+                if ends_poll:
+                    self._courses_updated.set()
+        finally:
+            if pending:
+                # Force the next scrape to refetch instead of trusting a 304
+                self._etag_cache.clear()
+            conn.close()
     
     def remove_from_watchlist(self, course_code: str):
         """Remove course from watchlist"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM user_watchlist WHERE course_code = ?", (course_code,))
-        conn.commit()
-        conn.close()
+        with self.db_lock:
+            cursor = self.conn.cursor()
+            cursor.execute(self.DELETE_WATCHLIST_SQL, (course_code,))
     
     def cleanup(self):
         """Clean up resources"""
         if self.driver:
             self.driver.quit()
+        if self._http:
+            self._http.close()
+            self._http = None
+        if self.conn:
+            self.conn.close()
+            self.conn = None
 
 def main():
     bot = OntarioTechBot()
@@ -419,7 +855,7 @@ def main():
         
         # Initial course data scraping
         print("🔍 Scraping course data...")
-        courses = bot.scrape_course_data(term="Winter 2025")
+        courses = bot.scrape_course_data(term=bot.term)
         bot.save_courses_to_db(courses)
         
         # Interactive menu
@@ -439,11 +875,10 @@ def main():
             
             if choice == "1":
                 # Show available courses
-                conn = sqlite3.connect(bot.db_path)
-                cursor = conn.cursor()
-                cursor.execute("SELECT code, name, available_spots, total_spots, status FROM courses WHERE available_spots > 0")
-                courses = cursor.fetchall()
-                conn.close()
+                with bot.db_lock:
+                    cursor = bot.conn.cursor()
+                    cursor.execute("SELECT code, name, available_spots, total_spots, status FROM courses WHERE available_spots > 0")
+                    courses = cursor.fetchall()
                 
                 if courses:
                     print("\n📚 Available Courses:")
@@ -458,14 +893,15 @@ def main():
                 bot.add_to_watchlist(course_code, priority)
             
             elif choice == "3":
-                watchlist = bot.get_watchlist_courses()
+                watchlist = bot.get_watchlist_with_availability()
                 if watchlist:
                     print("\n👁️ Your Watchlist:")
-                    for course_code in watchlist:
-                        course = bot.check_course_availability(course_code)
-                        if course:
-                            status = "✅ AVAILABLE" if course.available_spots > 0 else "❌ FULL"
-                            print(f"  {course_code}: {course.name} - {status}")
+                    for course_code, name, available_spots in watchlist:
+                        if name is None:
+                            print(f"  {course_code}: not found in course data")
+                            continue
+                        status = "✅ AVAILABLE" if available_spots > 0 else "❌ FULL"
+                        print(f"  {course_code}: {name} - {status}")
                 else:
                     print("📝 Watchlist is empty")
             
@@ -479,7 +915,7 @@ def main():
             
             elif choice == "6":
                 print("🔄 Refreshing course data...")
-                courses = bot.scrape_course_data(term="Winter 2025")
+                courses = bot.scrape_course_data(term=bot.term)
                 bot.save_courses_to_db(courses)
             
             elif choice == "7":